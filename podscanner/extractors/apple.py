@@ -3,9 +3,62 @@
 Apple Podcasts RSS extractor
 """
 
+import functools
+import logging
 import requests
 import re
-from typing import Optional
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils import create_http_session, load_json_file, save_json_file
+
+_log = logging.getLogger(__name__)
+
+_SESSION = create_http_session()
+
+# Patterns: /id1234567890, /podcast/name/id1234567890
+_ID_RE = re.compile(r'/id(\d+)')
+
+# iTunes lookups rarely change, so keep them on disk between runs
+_LOOKUP_CACHE_DIR = Path.home() / '.cache' / 'podscanner' / 'itunes'
+_LOOKUP_CACHE_TTL = 7 * 24 * 60 * 60
+
+def _load_cached_lookup(podcast_id: str) -> Optional[Dict[str, Any]]:
+    """Return the cached iTunes lookup for a podcast ID if it is fresh enough"""
+    cache_file = _LOOKUP_CACHE_DIR / f"{podcast_id}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime > _LOOKUP_CACHE_TTL:
+            return None
+    except OSError:
+        return None
+    return load_json_file(cache_file) or None
+
+def _save_cached_lookup(podcast_id: str, data: Dict[str, Any]) -> None:
+    """Write an iTunes lookup to the disk cache"""
+    try:
+        _LOOKUP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        _log.warning("Could not cache iTunes lookup for %s: %s", podcast_id, e)
+        return
+    save_json_file(_LOOKUP_CACHE_DIR / f"{podcast_id}.json", data, indent=None)
+
+@functools.lru_cache(maxsize=256)
+def _lookup_podcast(podcast_id: str) -> Dict[str, Any]:
+    """Look up a podcast via the iTunes Search API, using the disk cache when possible"""
+    data = _load_cached_lookup(podcast_id)
+    if data is not None:
+        print("💾 Using cached iTunes lookup")
+        return data
+    
+    search_url = f"https://itunes.apple.com/lookup?id={podcast_id}&entity=podcast"
+    response = _SESSION.get(search_url, timeout=10)
+    response.raise_for_status()
+    
+    data = response.json()
+    if data.get('results'):
+        _save_cached_lookup(podcast_id, data)
+    return data
 
 def extract_apple_podcast_rss(apple_url: str) -> Optional[str]:
     """Extract RSS feed URL from Apple Podcasts URL
@@ -20,8 +73,7 @@ def extract_apple_podcast_rss(apple_url: str) -> Optional[str]:
         print(f"🍎 Extracting RSS from: {apple_url}")
         
         # Extract podcast ID from URL
-        # Patterns: /id1234567890, /podcast/name/id1234567890
-        id_match = re.search(r'/id(\d+)', apple_url)
+        id_match = _ID_RE.search(apple_url)
         if not id_match:
             print("❌ Could not extract podcast ID from URL")
             return None
@@ -30,12 +82,7 @@ def extract_apple_podcast_rss(apple_url: str) -> Optional[str]:
         print(f"📱 Found podcast ID: {podcast_id}")
         
         # Use iTunes Search API to get RSS feed
-        search_url = f"https://itunes.apple.com/lookup?id={podcast_id}&entity=podcast"
-        
-        response = requests.get(search_url, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = _lookup_podcast(podcast_id)
         
         if not data.get('results'):
             print("❌ No results found from iTunes API")
@@ -5,9 +5,87 @@ Generic RSS feed extractor for websites
 
 import requests
 import re
+import lxml.html
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
 from typing import Optional
 from urllib.parse import urljoin, urlparse
 
+from ..utils import create_http_session
+
+_SESSION = create_http_session()
+
+# Feed discovery queries, evaluated in priority order
+# Standard RSS/Atom link tags
+_FEED_LINK_XPATH = etree.XPath(
+    "//link[@type='application/rss+xml' or @type='application/atom+xml']/@href"
+)
+# Common RSS URLs, filtered by _FEED_HREF_RE
+_HREF_XPATH = etree.XPath("//a/@href | //link/@href")
+_FEED_HREF_RE = re.compile(r'(?:feed|rss|podcast).*\.(?:xml|rss)$', re.IGNORECASE)
+# iTunes/Apple Podcasts meta tags
+_APPLE_META_XPATH = etree.XPath(
+    "//meta[@property='og:url'][contains(@content, 'podcasts.apple.com')]/@content"
+)
+
+# Conventional feed locations probed when a page links no feeds
+_COMMON_FEED_PATHS = ['/feed', '/rss', '/feed.xml', '/rss.xml', '/podcast.xml',
+                      '/feed/podcast', '/feeds/posts/default', '/atom.xml']
+# Probes are cheap guesses, so a miss or timeout isn't worth retrying with backoff
+_PROBE_SESSION = create_http_session(pool_maxsize=len(_COMMON_FEED_PATHS), retries=0)
+
+# Feed links live in <head>, so there's no need to buffer huge pages
+_MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+def _read_capped(response, limit: int) -> bytes:
+    """Read a streamed response body, stopping once `limit` bytes have arrived"""
+    chunks = []
+    total = 0
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= limit:
+                break
+    finally:
+        response.close()
+    return b''.join(chunks)
+
+def _probe_feed_url(test_url: str, headers: dict) -> bool:
+    """Check whether a URL answers a HEAD request with a feed content type"""
+    try:
+        test_response = _PROBE_SESSION.head(test_url, headers=headers, timeout=5, allow_redirects=True)
+    except requests.RequestException:
+        return False
+    if test_response.status_code != 200:
+        return False
+    content_type = test_response.headers.get('content-type', '').lower()
+    return any(ct in content_type for ct in ['xml', 'rss', 'atom'])
+
+def _probe_common_paths(base_url: str, headers: dict) -> list:
+    """Probe the common feed paths concurrently, returning hits in priority order"""
+    test_urls = [base_url + path for path in _COMMON_FEED_PATHS]
+    # Waiting on all probes at once bounds the search by the slowest one, not their sum
+    with ThreadPoolExecutor(max_workers=len(test_urls)) as executor:
+        results = executor.map(lambda test_url: _probe_feed_url(test_url, headers), test_urls)
+        return [test_url for test_url, is_feed in zip(test_urls, results) if is_feed]
+
+def _find_linked_feeds(url: str, content: bytes) -> list:
+    """Return the feed URLs a page links to, in priority order"""
+    # Parse once from bytes so lxml handles the charset itself
+    try:
+        doc = lxml.html.fromstring(content)
+    except etree.ParserError:
+        # Blank pages have nothing to scan; the caller still probes the common paths
+        return []
+    
+    candidates = list(_FEED_LINK_XPATH(doc))
+    candidates.extend(href for href in _HREF_XPATH(doc) if _FEED_HREF_RE.search(href))
+    candidates.extend(_APPLE_META_XPATH(doc))
+    
+    # Make URLs absolute, dropping duplicates while preserving order
+    return list(dict.fromkeys(urljoin(url, href.strip()) for href in candidates))
+
 def extract_rss_from_website(url: str) -> Optional[str]:
     """Try to find RSS feed URL from a generic website
     
@@ -24,50 +102,16 @@ def extract_rss_from_website(url: str) -> Optional[str]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, headers=headers, stream=True, timeout=(5, 15))
         response.raise_for_status()
         
-        content = response.text
-        
-        # Look for RSS feed links in various patterns
-        patterns = [
-            # Standard RSS link tags
-            r'<link[^>]+type=["\']application/rss\+xml["\'][^>]+href=["\']([^"\']+)["\']',
-            r'<link[^>]+href=["\']([^"\']+)["\'][^>]+type=["\']application/rss\+xml["\']',
-            # Atom feeds
-            r'<link[^>]+type=["\']application/atom\+xml["\'][^>]+href=["\']([^"\']+)["\']',
-            # Common RSS URLs
-            r'href=["\']([^"\']+(?:feed|rss|podcast)[^"\']*\.(?:xml|rss))["\']',
-            # iTunes/Apple Podcasts meta tags
-            r'<meta[^>]+property=["\']og:url["\'][^>]+content=["\']([^"\']+podcasts\.apple\.com[^"\']+)["\']',
-        ]
-        
-        found_feeds = []
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                # Make URL absolute
-                feed_url = urljoin(url, match)
-                if feed_url not in found_feeds:
-                    found_feeds.append(feed_url)
+        found_feeds = _find_linked_feeds(url, _read_capped(response, _MAX_PAGE_BYTES))
         
         # Try common RSS paths if no feeds found
         if not found_feeds:
-            common_paths = ['/feed', '/rss', '/feed.xml', '/rss.xml', '/podcast.xml', 
-                          '/feed/podcast', '/feeds/posts/default', '/atom.xml']
-            
-            base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
-            for path in common_paths:
-                try:
-                    test_url = base_url + path
-                    test_response = requests.head(test_url, headers=headers, timeout=5, allow_redirects=True)
-                    if test_response.status_code == 200:
-                        content_type = test_response.headers.get('content-type', '').lower()
-                        if any(ct in content_type for ct in ['xml', 'rss', 'atom']):
-                            found_feeds.append(test_url)
-                except:
-                    continue
+            parsed_url = urlparse(url)
+            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+            found_feeds = _probe_common_paths(base_url, headers)
         
         if found_feeds:
             # Return the first feed found
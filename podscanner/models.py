@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class EpisodeInfo:
     """Container for episode information"""
     title: str
@@ -19,6 +19,7 @@ class EpisodeInfo:
     audio_path: Path
     transcript_path: Path
     safe_title: str
+    duration: Optional[float] = None  # Seconds, from the feed when it says
 
 @dataclass
 class DownloadConfig:
@@ -27,14 +28,19 @@ class DownloadConfig:
     transcripts_dir: Path = Path("transcripts")
     max_episodes: Optional[int] = None
     max_workers: Optional[int] = None
+    download_workers: int = 4
+    download_parts: int = 4  # Parallel range requests per large episode file
     use_multiprocessing: bool = True
+    transcribe_enabled: bool = True
+    # Transcribe in-process with faster-whisper's batched pipeline instead of a worker pool
+    batch_size: Optional[int] = None
     
     def __post_init__(self):
         """Ensure directories exist"""
         self.downloads_dir.mkdir(exist_ok=True)
         self.transcripts_dir.mkdir(exist_ok=True)
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingStats:
     """Statistics from processing operations"""
     total_episodes: int = 0
@@ -42,4 +48,6 @@ class ProcessingStats:
     skipped: int = 0
     failed: int = 0
     transcribed: int = 0
-    already_transcribed: int = 0 
\ No newline at end of file
+    already_transcribed: int = 0
+    # Set when the feed answered 304 Not Modified, so no episodes were parsed
+    feed_unchanged: bool = False 
\ No newline at end of file
@@ -6,50 +6,266 @@ Handles RSS feed parsing and episode downloading.
 """
 
 import requests
+import urllib3
 import feedparser
+import sqlite3
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from lxml import etree
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 from urllib.parse import urlparse
 
 from ..models import EpisodeInfo, DownloadConfig, ProcessingStats
-from ..utils import sanitize_filename, get_episode_id, get_file_extension_from_url, load_json_file, save_json_file, create_episode_metadata, download_file
+from ..utils import EPISODE_ID_SCHEME, sanitize_filename, get_episode_id, get_file_extension_from_url, parse_duration, load_json_file, save_json_file, create_episode_metadata, download_file_ranged, create_http_session, list_dir_names
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+ITUNES_NS = '{http://www.itunes.com/dtds/podcast-1.0.dtd}'
+
+# Rough audio bitrate (128 kbps) used to estimate duration from enclosure size
+ESTIMATED_BYTES_PER_SECOND = 16000
+
+class _RecordingReader:
+    """File-like wrapper that keeps a copy of what is read from a stream
+    
+    Lets the feed be parsed straight off the socket while keeping the bytes
+    needed if parsing has to fall back to feedparser. Recording stops once
+    that fallback is no longer possible, so parsed feeds aren't held in memory.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = BytesIO()
+    
+    @property
+    def recording(self) -> bool:
+        return self.buffer is not None
+    
+    def stop_recording(self):
+        """Drop the copy kept so far and stop keeping one"""
+        self.buffer = None
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        if self.buffer is not None:
+            self.buffer.write(data)
+        return data
+    
+    def getvalue(self) -> bytes:
+        """Return everything read so far plus the rest of the stream"""
+        return self.buffer.getvalue() + self.stream.read()
+
+class _TokenBucket:
+    """Thread-safe token bucket limiting how often new requests may start"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class _ConnectionBudget:
+    """Per-host pool of connection slots that one download may claim several of"""
+    
+    def __init__(self, limit: int):
+        self.free = limit
+        self._cond = threading.Condition()
+    
+    def acquire(self):
+        """Block until a slot is free, then take it"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.free > 0)
+            self.free -= 1
+    
+    def try_acquire(self, wanted: int) -> int:
+        """Take up to `wanted` slots without waiting and return how many were taken"""
+        with self._cond:
+            taken = min(wanted, self.free)
+            self.free -= taken
+            return taken
+    
+    def release(self, count: int):
+        """Return slots taken by acquire"""
+        with self._cond:
+            self.free += count
+            self._cond.notify_all()
 
 class PodcastDownloader:
     """Handles RSS feed parsing and episode downloading"""
     
+    # Connections open at once per host, counting every range of a ranged download
+    MAX_CONNECTIONS_PER_HOST = 4
+    # Downloads started per second per host, with short bursts allowed
+    HOST_REQUEST_RATE = 2.0
+    HOST_REQUEST_BURST = 4
+    # Stays under SQLite's default limit on bound parameters per statement
+    SQL_BATCH_SIZE = 500
+    
     def __init__(self, config: DownloadConfig):
         self.config = config
         self.processed_episodes_file = Path("processed_episodes.json")
-        self.processed_episodes = load_json_file(self.processed_episodes_file)
+        self.processed_episodes_db = Path("processed_episodes.db")
+        self.feed_cache_file = Path("feed_cache.json")
+        self.feed_cache = load_json_file(self.feed_cache_file)
+        self._pending_feed_state = {}
+        self.session = create_http_session()
+        self._lock = threading.Lock()
+        # Limit concurrent connections per host so parallel downloads stay polite
+        self._host_connections = defaultdict(lambda: _ConnectionBudget(self.MAX_CONNECTIONS_PER_HOST))
+        # and don't start new ones faster than the host's rate allows
+        self._host_buckets = defaultdict(lambda: _TokenBucket(self.HOST_REQUEST_RATE, self.HOST_REQUEST_BURST))
+        self._open_processed_db()
+    
+    def _open_processed_db(self):
+        """Open the processed-episodes database, migrating the legacy JSON file once"""
+        # Shared with download/transcription threads; every access goes through self._lock
+        self.db = sqlite3.connect(self.processed_episodes_db, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS episodes ("
+            "id TEXT PRIMARY KEY, title TEXT, published TEXT, audio_url TEXT, "
+            "processed_date TEXT, audio_file TEXT, transcript_file TEXT)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._rehash_episode_ids()
+        
+        if not self.processed_episodes_file.exists():
+            return
+        
+        # Legacy IDs are re-derived from the stored metadata so they match the current scheme
+        legacy_episodes = load_json_file(self.processed_episodes_file)
+        self.db.execute("BEGIN")
+        changes_before = self.db.total_changes
+        self.db.executemany(
+            "INSERT OR IGNORE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                self._episode_row(get_episode_id(metadata, metadata.get('audio_url', '')), metadata)
+                for metadata in legacy_episodes.values()
+            ]
+        )
+        # INSERT OR IGNORE skips episodes whose ID is already recorded
+        migrated = self.db.total_changes - changes_before
+        self.db.execute("COMMIT")
+        self.processed_episodes_file.rename(self.processed_episodes_file.with_suffix('.json.migrated'))
+        print(f"💾 Migrated {migrated} processed episodes to {self.processed_episodes_db}")
+        if migrated != len(legacy_episodes):
+            print(f"⚠️  Merged {len(legacy_episodes) - migrated} processed episodes whose URLs map to an already recorded ID")
+    
+    def _rehash_episode_ids(self):
+        """Re-key stored episodes if the episode ID hash scheme has changed"""
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'id_scheme'").fetchone()
+        # Databases created before the scheme was recorded used MD5
+        if (row[0] if row else 'md5') == EPISODE_ID_SCHEME:
+            return
+        
+        self.db.execute("BEGIN")
+        (rows_before,) = self.db.execute("SELECT COUNT(*) FROM episodes").fetchone()
+        rekeyed = 0
+        for old_id, title, published, audio_url in self.db.execute(
+            "SELECT id, title, published, audio_url FROM episodes"
+        ).fetchall():
+            new_id = get_episode_id({'title': title, 'published': published}, audio_url)
+            if new_id != old_id:
+                self.db.execute("UPDATE OR REPLACE episodes SET id = ? WHERE id = ?", (new_id, old_id))
+                rekeyed += 1
+        # UPDATE OR REPLACE drops rows whose new ID collides with another row's
+        (rows_after,) = self.db.execute("SELECT COUNT(*) FROM episodes").fetchone()
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('id_scheme', ?)", (EPISODE_ID_SCHEME,))
+        self.db.execute("COMMIT")
+        
+        if rekeyed:
+            print(f"💾 Re-keyed {rekeyed} processed episodes for {EPISODE_ID_SCHEME} episode IDs")
+        if rows_before != rows_after:
+            print(f"⚠️  Merged {rows_before - rows_after} processed episodes whose URLs now map to the same ID")
+    
+    @staticmethod
+    def _episode_row(episode_id: str, metadata: dict) -> tuple:
+        """Build an episodes table row from a metadata dict"""
+        return (
+            episode_id,
+            metadata.get('title'),
+            metadata.get('published'),
+            metadata.get('audio_url'),
+            metadata.get('processed_date'),
+            metadata.get('audio_file'),
+            metadata.get('transcript_file')
+        )
     
     def is_episode_processed(self, episode_id: str) -> bool:
         """Check if an episode has already been processed"""
-        return episode_id in self.processed_episodes
+        with self._lock:
+            row = self.db.execute("SELECT 1 FROM episodes WHERE id = ? LIMIT 1", (episode_id,)).fetchone()
+        return row is not None
     
-    def mark_episode_processed(self, episode_id: str, episode_info: dict):
+    def processed_episode_ids(self, episode_ids: Iterable[str]) -> frozenset:
+        """Return which of the given episode IDs are already processed, in a few queries"""
+        episode_ids = list(episode_ids)
+        processed = set()
+        with self._lock:
+            for start in range(0, len(episode_ids), self.SQL_BATCH_SIZE):
+                batch = episode_ids[start:start + self.SQL_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                rows = self.db.execute(f"SELECT id FROM episodes WHERE id IN ({placeholders})", batch)
+                processed.update(row[0] for row in rows)
+        return frozenset(processed)
+    
+    def mark_episode_processed(self, episode_id: str, episode_info: dict, processed_date: Optional[str] = None):
         """Mark an episode as processed"""
-        self.processed_episodes[episode_id] = create_episode_metadata(episode_info, episode_id)
-        save_json_file(self.processed_episodes_file, self.processed_episodes)
+        row = self._episode_row(episode_id, create_episode_metadata(episode_info, episode_id, processed_date))
+        with self._lock:
+            self.db.execute("INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?)", row)
     
-    def parse_episodes_from_feed(self, rss_url: str) -> List[EpisodeInfo]:
-        """Parse RSS feed and return list of episode information"""
+    def parse_episodes_from_feed(self, rss_url: str, max_episodes: Optional[int] = None,
+                                 stats: Optional[ProcessingStats] = None) -> List[EpisodeInfo]:
+        """Parse RSS feed and return list of episode information
+        
+        Episodes that were already processed are left out without building their
+        EpisodeInfo. With `stats`, they are counted there as skipped and an
+        unchanged feed is flagged with `stats.feed_unchanged`.
+        """
         print(f"📡 Parsing RSS feed: {rss_url}")
-        feed = feedparser.parse(rss_url)
+        max_episodes = max_episodes or self.config.max_episodes
         
-        if feed.bozo:
-            print("⚠️  Warning: RSS feed has parsing issues")
+        try:
+            response = self._fetch_feed(rss_url, max_episodes)
+            if response is None:
+                print("✅ Feed unchanged since last scan, nothing new to process")
+                if stats is not None:
+                    stats.feed_unchanged = True
+                return []
+            
+            with response:
+                episodes = self._parse_feed_entries(response.raw, max_episodes)
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            print(f"❌ Could not fetch RSS feed: {e}")
+            return []
         
-        if not hasattr(feed, 'entries') or not feed.entries:
+        if not episodes:
             print("❌ No episodes found in feed")
             return []
         
-        print(f"📋 Found {len(feed.entries)} episodes")
-        
-        # Limit episodes if specified
-        episodes = feed.entries[:self.config.max_episodes] if self.config.max_episodes else feed.entries
-        episode_list = []
+        print(f"📋 Found {len(episodes)} episodes")
         
+        # Resolve audio URLs and IDs first so processed episodes are looked up in one go
+        candidates = []
         for i, episode in enumerate(episodes, 1):
             # Find audio URL
             audio_url = self._find_audio_url(episode)
@@ -58,10 +274,23 @@ class PodcastDownloader:
                 print(f"⚠️  Episode {i}: No audio URL found, skipping...")
                 continue
             
+            candidates.append((i, episode, audio_url, get_episode_id(episode, audio_url)))
+        
+        processed_ids = self.processed_episode_ids(candidate[3] for candidate in candidates)
+        if stats is not None:
+            stats.total_episodes += len(candidates)
+        
+        episode_list = []
+        skipped = 0
+        
+        for i, episode, audio_url, episode_id in candidates:
+            if episode_id in processed_ids:
+                skipped += 1
+                continue
+            
             # Create episode info
             title = episode.get('title', f'episode_{i}')
             safe_title = sanitize_filename(title)
-            episode_id = get_episode_id(episode, audio_url)
             
             # Get file extension from URL
             ext = get_file_extension_from_url(audio_url)
@@ -77,13 +306,151 @@ class PodcastDownloader:
                 episode_id=episode_id,
                 audio_path=audio_path,
                 transcript_path=transcript_path,
-                safe_title=safe_title
+                safe_title=safe_title,
+                duration=self._episode_duration(episode)
             )
             
             episode_list.append(episode_info)
         
+        if skipped:
+            if stats is not None:
+                stats.skipped += skipped
+            print(f"⏭️  Skipping {skipped} already processed episodes")
+        
         return episode_list
     
+    def _parse_feed_entries(self, stream, max_episodes: Optional[int]) -> list:
+        """Parse feed entries, stopping once max_episodes items have been read
+        
+        RSS <item> and Atom <entry> elements are streamed off the response with
+        lxml's iterparse, so a long back catalogue is neither downloaded nor
+        parsed when only the latest few episodes are wanted. Feeds that yield
+        no entries fall back to feedparser.
+        """
+        reader = _RecordingReader(stream)
+        entries = []
+        try:
+            for _, item in etree.iterparse(reader, tag=('item', f'{ATOM_NS}entry'), recover=True):
+                if item.tag == 'item':
+                    entry = self._rss_item_entry(item)
+                else:
+                    entry = self._atom_entry(item)
+                entries.append(entry)
+                # With an entry parsed there's no feedparser fallback, so stop buffering
+                if reader.recording:
+                    reader.stop_recording()
+                
+                item.clear()
+                if max_episodes and len(entries) >= max_episodes:
+                    break
+        except etree.XMLSyntaxError:
+            # Entries parsed before the error are kept, as the body is no longer buffered
+            if reader.recording:
+                entries = []
+        
+        if entries:
+            return entries
+        
+        feed = feedparser.parse(reader.getvalue())
+        
+        if feed.bozo:
+            print("⚠️  Warning: RSS feed has parsing issues")
+        
+        # Limit episodes if specified
+        return feed.entries[:max_episodes] if max_episodes else feed.entries
+    
+    @staticmethod
+    def _rss_item_entry(item) -> dict:
+        """Build a feedparser-style entry dict from an RSS <item>"""
+        entry = {
+            'enclosures': [
+                {'href': enclosure.get('url'), 'type': enclosure.get('type', ''), 'length': enclosure.get('length')}
+                for enclosure in item.iterfind('enclosure')
+            ]
+        }
+        title = item.findtext('title')
+        if title:
+            entry['title'] = title.strip()
+        published = item.findtext('pubDate')
+        if published:
+            entry['published'] = published.strip()
+        duration = item.findtext(f'{ITUNES_NS}duration')
+        if duration:
+            entry['itunes_duration'] = duration.strip()
+        return entry
+    
+    @staticmethod
+    def _atom_entry(item) -> dict:
+        """Build a feedparser-style entry dict from an Atom <entry>"""
+        entry = {
+            'enclosures': [
+                {'href': link.get('href'), 'type': link.get('type', ''), 'length': link.get('length')}
+                for link in item.iterfind(f'{ATOM_NS}link[@rel="enclosure"]')
+            ]
+        }
+        title = item.findtext(f'{ATOM_NS}title')
+        if title:
+            entry['title'] = title.strip()
+        published = item.findtext(f'{ATOM_NS}published') or item.findtext(f'{ATOM_NS}updated')
+        if published:
+            entry['published'] = published.strip()
+        return entry
+    
+    def _fetch_feed(self, rss_url: str, max_episodes: Optional[int]) -> Optional[requests.Response]:
+        """Request the feed through the shared session using a conditional GET
+        
+        Returns the streamed response, or None when the server reports the
+        feed unchanged (HTTP 304).
+        """
+        headers = {'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8'}
+        
+        # Validators are only reused if the last complete scan covered at least as many episodes
+        cached = self.feed_cache.get(rss_url, {})
+        cached_limit = cached.get('max_episodes')
+        if cached and (cached_limit is None or (max_episodes is not None and max_episodes <= cached_limit)):
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        response = self.session.get(rss_url, headers=headers, stream=True, timeout=(5, 30))
+        if response.status_code == 304:
+            response.close()
+            return None
+        response.raise_for_status()
+        # Let urllib3 undo gzip/deflate so the parser reads plain XML
+        response.raw.decode_content = True
+        
+        self._pending_feed_state[rss_url] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'max_episodes': max_episodes
+        }
+        return response
+    
+    def save_feed_state(self, rss_url: str):
+        """Persist the feed's cache validators once all of its episodes were processed"""
+        state = self._pending_feed_state.pop(rss_url, None)
+        if state and (state['etag'] or state['last_modified']):
+            self.feed_cache[rss_url] = state
+            save_json_file(self.feed_cache_file, self.feed_cache)
+    
+    @staticmethod
+    def _episode_duration(episode) -> Optional[float]:
+        """Episode length in seconds from itunes:duration, else estimated from enclosure size"""
+        duration = parse_duration(episode.get('itunes_duration'))
+        if duration:
+            return duration
+        
+        for enclosure in episode.get('enclosures', []):
+            try:
+                length = int(enclosure.get('length') or 0)
+            except ValueError:
+                continue
+            if length > 0:
+                return length / ESTIMATED_BYTES_PER_SECOND
+        return None
+    
     def _find_audio_url(self, episode) -> str:
         """Extract audio URL from episode entry"""
         audio_url = None
@@ -95,8 +462,8 @@ class PodcastDownloader:
                 break
         
         # Method 2: Check enclosures
-        if not audio_url and hasattr(episode, 'enclosures'):
-            for enclosure in episode.enclosures:
+        if not audio_url:
+            for enclosure in episode.get('enclosures', []):
                 if 'audio' in enclosure.get('type', '').lower():
                     audio_url = enclosure.get('href')
                     break
@@ -104,48 +471,90 @@ class PodcastDownloader:
         return audio_url
     
     def download_file(self, url: str, filepath: Path) -> bool:
-        """Download a file using the utility function"""
-        return download_file(url, filepath)
+        """Download a file using the utility function
+        
+        Each download holds one of the host's connection slots. Once a ranged
+        download is chosen it also claims whatever further slots are free, up
+        to `download_parts` in total, so ranges never exceed the host limit.
+        """
+        budget = self._host_budget(url)
+        budget.acquire()
+        extra = 0
+        
+        def claim_parts(wanted: int) -> int:
+            nonlocal extra
+            extra = budget.try_acquire(wanted - 1)
+            return 1 + extra
+        
+        try:
+            self._host_bucket(url).acquire()
+            return download_file_ranged(url, filepath, parts=self.config.download_parts,
+                                        session=self.session, claim_parts=claim_parts)
+        finally:
+            budget.release(1 + extra)
     
-    def download_episodes(self, episodes: List[EpisodeInfo]) -> tuple[List[EpisodeInfo], ProcessingStats]:
-        """Download all episodes, return list of successfully downloaded episodes and stats"""
+    def _host_budget(self, url: str) -> _ConnectionBudget:
+        """Get the connection budget for the URL's host"""
+        with self._lock:
+            return self._host_connections[urlparse(url).netloc]
+    
+    def _host_bucket(self, url: str) -> _TokenBucket:
+        """Get the request-rate bucket for the URL's host"""
+        with self._lock:
+            return self._host_buckets[urlparse(url).netloc]
+    
+    def iter_downloaded_episodes(self, episodes: List[EpisodeInfo], stats: ProcessingStats) -> Iterator[EpisodeInfo]:
+        """Download episodes concurrently, yielding each one as soon as its audio is available
+        
+        Episodes that are already on disk are yielded first, then new downloads
+        in completion order, so a consumer can start transcribing while the
+        remaining downloads are still in flight. Already processed episodes are
+        expected to have been dropped by parse_episodes_from_feed.
+        """
         print(f"\n📥 === DOWNLOAD PHASE ===")
-        downloaded_episodes = []
-        stats = ProcessingStats(total_episodes=len(episodes))
+        pending = []
+        existing_audio = list_dir_names(self.config.downloads_dir)
         
-        for i, episode in enumerate(episodes, 1):
-            print(f"\n📥 Download {i}/{len(episodes)}: {episode.title}")
-            
-            # Check if already processed
-            if self.is_episode_processed(episode.episode_id):
-                print(f"✅ Already processed (ID: {episode.episode_id[:8]}...), skipping download")
-                stats.skipped += 1
-                # Still add to list if audio file exists for potential transcription
-                if episode.audio_path.exists():
-                    downloaded_episodes.append(episode)
-                continue
-            
+        for episode in episodes:
             # Check if audio file already exists
-            if episode.audio_path.exists():
+            if episode.audio_path.name in existing_audio:
                 print(f"✅ Audio file already exists: {episode.audio_path.name}")
-                downloaded_episodes.append(episode)
                 stats.downloaded += 1
+                yield episode
                 continue
             
-            # Download the file
-            if self.download_file(episode.audio_url, episode.audio_path):
-                downloaded_episodes.append(episode)
-                stats.downloaded += 1
-            else:
-                print(f"❌ Failed to download {episode.title}")
-                stats.failed += 1
-            
-            # Small delay to be respectful to servers
-            time.sleep(0.5)
+            pending.append(episode)
+        
+        if not pending:
+            return
+        
+        print(f"🚀 Downloading {len(pending)} episodes with {self.config.download_workers} workers...")
         
+        with ThreadPoolExecutor(max_workers=self.config.download_workers) as executor:
+            future_to_episode = {
+                executor.submit(self.download_file, episode.audio_url, episode.audio_path): episode
+                for episode in pending
+            }
+            
+            for future in as_completed(future_to_episode):
+                episode = future_to_episode[future]
+                if future.result():
+                    stats.downloaded += 1
+                    yield episode
+                else:
+                    print(f"❌ Failed to download {episode.title}")
+                    stats.failed += 1
+    
+    def print_download_summary(self, stats: ProcessingStats):
+        """Print download statistics"""
         print(f"\n📊 Download Summary:")
         print(f"   • Downloaded: {stats.downloaded} episodes")
         print(f"   • Skipped (already processed): {stats.skipped} episodes")
         print(f"   • Failed: {stats.failed} episodes")
-        
-        return downloaded_episodes, stats 
\ No newline at end of file
+    
+    def download_episodes(self, episodes: List[EpisodeInfo]) -> tuple[List[EpisodeInfo], ProcessingStats]:
+        """Download all episodes, return list of successfully downloaded episodes and stats"""
+        stats = ProcessingStats(total_episodes=len(episodes))
+        downloaded_episodes = list(self.iter_downloaded_episodes(episodes, stats))
+        self.print_download_summary(stats)
+        return downloaded_episodes, stats
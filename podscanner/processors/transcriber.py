@@ -6,68 +6,154 @@ Handles parallel transcription with CPU optimization.
 """
 
 import os
-import whisper
 import multiprocessing
 import psutil
 import threading
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 
 from ..models import EpisodeInfo, DownloadConfig, ProcessingStats
+from ..utils import format_time_duration, list_dir_names
 
-def transcribe_audio_worker_func(episode_info_dict: dict) -> Tuple[dict, bool]:
-    """Standalone worker function for multiprocessing"""
-    import whisper
-    from pathlib import Path
-    from ..models import EpisodeInfo
+WHISPER_MODEL_NAME = "base"
+
+# Mean episode lengths (seconds) beyond which fewer, or more, workers are recommended
+LONG_EPISODE_SECONDS = 30 * 60
+SHORT_EPISODE_SECONDS = 5 * 60
+
+# Upper bound on recommended workers; each worker process loads its own Whisper model
+MAX_RECOMMENDED_WORKERS = 8
+
+# Chunks decoded per forward pass when a GPU is used and no batch size is configured
+GPU_BATCH_SIZE = 16
+
+def detect_whisper_device() -> str:
+    """Return "cuda" when CTranslate2 can see a GPU, "cpu" otherwise"""
+    try:
+        import ctranslate2
+    except ImportError:
+        return "cpu"
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+def create_whisper_model(model_name: str = WHISPER_MODEL_NAME, cpu_threads: int = 0,
+                         device: Optional[str] = None, num_workers: int = 1):
+    """Load a faster-whisper model: int8 on CPU, float16 on CUDA GPUs
     
-    # Reconstruct EpisodeInfo from dict
-    episode_info = EpisodeInfo(**episode_info_dict)
+    The backend is imported here rather than at module level so code paths
+    that never transcribe don't pay for loading it. `cpu_threads` caps the
+    backend's own thread pool (0 lets CTranslate2 decide), and `num_workers`
+    lets that many threads transcribe with the one loaded model concurrently.
+    """
+    from faster_whisper import WhisperModel
+    
+    device = device or detect_whisper_device()
+    compute_type = "float16" if device == "cuda" else "int8"
+    return WhisperModel(model_name, device=device, compute_type=compute_type,
+                        cpu_threads=cpu_threads, num_workers=num_workers)
+
+def transcribe_audio_file(model, audio_path: Path, batch_size: Optional[int] = None) -> str:
+    """Transcribe an audio file, skipping silent stretches via voice activity detection
     
+    With `batch_size`, `model` must be a BatchedInferencePipeline, which decodes
+    that many voiced chunks of the file per forward pass.
+    """
+    options = {'batch_size': batch_size} if batch_size else {}
+    segments, _ = model.transcribe(str(audio_path), beam_size=1, vad_filter=True, **options)
+    return "".join(segment.text for segment in segments)
+
+def write_transcript(episode_info: EpisodeInfo, transcript: str):
+    """Write a transcript file with the episode metadata header"""
+    # Build the whole file first so it goes out in a single write
+    content = (
+        f"Title: {episode_info.title}\n"
+        f"URL: {episode_info.audio_url}\n"
+        f"Published: {episode_info.published}\n"
+        f"Episode ID: {episode_info.episode_id}\n"
+        f"\n--- TRANSCRIPT ---\n\n"
+        f"{transcript}"
+    )
+    Path(episode_info.transcript_path).write_text(content, encoding='utf-8')
+
+def processed_episode_data(episode_info: EpisodeInfo) -> dict:
+    """Build the episode data recorded when an episode is marked processed"""
+    return {
+        'title': episode_info.title,
+        'published': episode_info.published,
+        'audio_url': episode_info.audio_url,
+        'audio_file': episode_info.audio_path.name,
+        'transcript_file': episode_info.transcript_path.name
+    }
+
+# Whisper model owned by the current worker process, set by _init_worker
+_WORKER_MODEL = None
+
+def _init_worker(model_name: str, cpu_threads: int):
+    """ProcessPoolExecutor initializer: load the Whisper model once per worker process"""
+    global _WORKER_MODEL
     try:
-        # Load Whisper model in this process
-        print(f"🎙️  [PID {os.getpid()}] Loading Whisper & transcribing: {episode_info.safe_title}")
-        model = whisper.load_model("base")
-        
-        result = model.transcribe(str(episode_info.audio_path))
-        transcript = result["text"]
-        
-        # Write transcript
-        with open(episode_info.transcript_path, 'w', encoding='utf-8') as f:
-            f.write(f"Title: {episode_info.title}\n")
-            f.write(f"URL: {episode_info.audio_url}\n")
-            f.write(f"Published: {episode_info.published}\n")
-            f.write(f"Episode ID: {episode_info.episode_id}\n")
-            f.write(f"\n--- TRANSCRIPT ---\n\n")
-            f.write(transcript)
+        print(f"🎙️  [PID {os.getpid()}] Loading Whisper model...")
+        _WORKER_MODEL = create_whisper_model(model_name, cpu_threads)
+    except Exception as e:
+        # Leave the pool usable; each task reports the failure instead
+        print(f"❌ [PID {os.getpid()}] Could not load Whisper model: {e}")
+
+def transcribe_audio_worker_func(episode_info: EpisodeInfo) -> Optional[str]:
+    """Standalone worker function for multiprocessing, returns the transcript or None on failure"""
+    try:
+        if _WORKER_MODEL is None:
+            raise RuntimeError("Whisper model is not loaded in this worker")
+        
+        print(f"🎙️  [PID {os.getpid()}] Transcribing: {episode_info.safe_title}")
+        transcript = transcribe_audio_file(_WORKER_MODEL, episode_info.audio_path)
         
         print(f"✅ [PID {os.getpid()}] Transcribed: {episode_info.safe_title}")
-        return episode_info_dict, True
+        return transcript
         
     except Exception as e:
         print(f"❌ [PID {os.getpid()}] Error transcribing {episode_info.safe_title}: {e}")
-        return episode_info_dict, False
+        return None
+
+def available_cpu_count() -> int:
+    """Number of CPUs this process may run on
+    
+    Unlike multiprocessing.cpu_count(), this honours taskset and cgroup
+    cpusets, so containers pinned to a few cores don't get oversized pools.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return multiprocessing.cpu_count()
 
 class CPUMonitor:
     """Monitor CPU usage and suggest optimal worker count"""
     
     def __init__(self):
-        self.cpu_count = multiprocessing.cpu_count()
-        self.monitoring = False
-        self.cpu_history = []
+        self.cpu_count = available_cpu_count()
+        self.cpu_history = deque(maxlen=10)
         
-    def get_optimal_workers(self, current_workers=None) -> int:
-        """Calculate optimal number of workers based on CPU cores and usage"""
-        # Basic calculation: use 75-90% of available cores
-        optimal = max(1, int(self.cpu_count * 0.8))
+    def get_optimal_workers(self, current_workers=None, mean_duration: Optional[float] = None) -> int:
+        """Calculate optimal number of workers based on CPU cores and episode length
+        
+        Long episodes hold a worker (and its memory) for a long time, so fewer run
+        at once; short ones finish quickly enough to keep every core busy.
+        """
+        if mean_duration and mean_duration > LONG_EPISODE_SECONDS:
+            optimal = max(1, self.cpu_count // 2)
+        elif mean_duration and mean_duration < SHORT_EPISODE_SECONDS:
+            optimal = self.cpu_count
+        else:
+            # Basic calculation: use 75-90% of available cores
+            optimal = max(1, int(self.cpu_count * 0.8))
         
         # Cap at reasonable maximum (Whisper models are memory intensive)
-        optimal = min(optimal, 8)
+        optimal = min(optimal, MAX_RECOMMENDED_WORKERS)
         
         print(f"💻 CPU Info:")
         print(f"   • Available cores: {self.cpu_count}")
+        if mean_duration:
+            print(f"   • Mean episode length: {format_time_duration(mean_duration)}")
         print(f"   • Recommended workers: {optimal}")
         
         if current_workers and current_workers != optimal:
@@ -80,219 +166,250 @@ class CPUMonitor:
         return optimal
     
     def start_monitoring(self):
-        """Start background CPU monitoring"""
-        self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
-        
-    def stop_monitoring(self):
-        """Stop CPU monitoring"""
-        self.monitoring = False
-        
-    def _monitor_loop(self):
-        """Background monitoring loop"""
-        while self.monitoring:
-            cpu_percent = psutil.cpu_percent(interval=5)
-            self.cpu_history.append(cpu_percent)
-            
-            # Keep only last 10 measurements
-            if len(self.cpu_history) > 10:
-                self.cpu_history.pop(0)
-                
-            # Print CPU usage every 30 seconds during transcription
-            if len(self.cpu_history) % 6 == 0:  # Every 30 seconds
-                avg_cpu = sum(self.cpu_history) / len(self.cpu_history)
-                print(f"📊 CPU Usage: {avg_cpu:.1f}% (avg last {len(self.cpu_history)*5}s)")
-                
-                if avg_cpu < 60:
-                    print(f"💡 Low CPU usage - consider increasing workers for better performance")
-                elif avg_cpu > 95:
-                    print(f"⚠️  High CPU usage - consider reducing workers if system becomes unresponsive")
+        """Reset CPU sampling for a new transcription run"""
+        self.cpu_history.clear()
+        # Prime psutil's counters; the first non-blocking reading is meaningless
+        psutil.cpu_percent(interval=None)
+    
+    def record_sample(self):
+        """Record CPU usage since the previous sample, taken as each transcription completes"""
+        self.cpu_history.append(psutil.cpu_percent(interval=None))
+    
+    def print_usage(self):
+        """Print average CPU usage over the recent samples with a tuning hint"""
+        if not self.cpu_history:
+            return
+        
+        avg_cpu = sum(self.cpu_history) / len(self.cpu_history)
+        print(f"📊 CPU Usage: {avg_cpu:.1f}% (avg over last {len(self.cpu_history)} transcriptions)")
+        
+        if avg_cpu < 60:
+            print(f"💡 Low CPU usage - consider increasing workers for better performance")
+        elif avg_cpu > 95:
+            print(f"⚠️  High CPU usage - consider reducing workers if system becomes unresponsive")
 
 class PodcastTranscriber:
     """Handles parallel transcription with CPU optimization"""
     
-    def __init__(self, config: DownloadConfig):
+    def __init__(self, config: DownloadConfig, mean_episode_duration: Optional[float] = None):
         self.config = config
         self.cpu_monitor = CPUMonitor()
+        self.device = detect_whisper_device()
+        self.batch_size = config.batch_size
         
         # Auto-determine optimal workers if not specified
         if config.max_workers is None:
-            self.max_workers = self.cpu_monitor.get_optimal_workers()
+            self.max_workers = self.cpu_monitor.get_optimal_workers(mean_duration=mean_episode_duration)
         else:
             self.max_workers = config.max_workers
-            self.cpu_monitor.get_optimal_workers(config.max_workers)
+            self.cpu_monitor.get_optimal_workers(config.max_workers, mean_episode_duration)
+        
+        # A GPU is owned by one in-process model; feed it batches rather than
+        # competing worker processes
+        if self.device == "cuda":
+            self.max_workers = 1
+            self.batch_size = self.batch_size or GPU_BATCH_SIZE
+        
+        # CTranslate2 parallelizes internally too; split the cores between workers
+        # so N workers don't each spin up a thread per core. Batched mode runs a single model.
+        if self.batch_size:
+            self.threads_per_worker = self.cpu_monitor.cpu_count
+        else:
+            self.threads_per_worker = max(1, self.cpu_monitor.cpu_count // self.max_workers)
+        
+        # Don't load Whisper model here - it is loaded on first use by a transcription worker
+        self._whisper_model = None
+        self._batched_pipeline = None
+        self._model_lock = threading.Lock()
+    
+    @property
+    def whisper_model(self):
+        """Whisper model, loaded on first access (shared by transcription threads)
         
-        # Don't load Whisper model here - load it in transcription workers
-        self.whisper_model = None
+        Threads share this single copy of the weights; CTranslate2 runs one
+        transcription per worker at a time, so it gets a worker per thread.
+        """
+        if self._whisper_model is None:
+            with self._model_lock:
+                if self._whisper_model is None:
+                    print(f"🎙️  [Worker] Loading Whisper model...")
+                    num_workers = 1 if self.batch_size else self.max_workers
+                    self._whisper_model = create_whisper_model(
+                        cpu_threads=self.threads_per_worker, device=self.device, num_workers=num_workers
+                    )
+                    print(f"🎙️  [Worker] Whisper model loaded!")
+        return self._whisper_model
     
-    def load_whisper_model(self):
-        """Load Whisper model (called by transcription workers)"""
-        if self.whisper_model is None:
-            print(f"🎙️  [Worker] Loading Whisper model...")
-            self.whisper_model = whisper.load_model("base")
-            print(f"🎙️  [Worker] Whisper model loaded!")
-        return self.whisper_model
+    @property
+    def batched_pipeline(self):
+        """Batched inference pipeline around the Whisper model, created on first access"""
+        if self._batched_pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched_pipeline = BatchedInferencePipeline(model=self.whisper_model)
+        return self._batched_pipeline
     
-    def transcribe_audio_worker(self, episode_info: EpisodeInfo) -> Tuple[EpisodeInfo, bool]:
+    def transcribe_audio_worker(self, episode_info: EpisodeInfo) -> Tuple[EpisodeInfo, Optional[str]]:
         """Worker function to transcribe a single audio file (ThreadPool version)"""
         try:
-            # Load Whisper model in this worker
-            model = self.load_whisper_model()
+            # Load Whisper model on first use
+            model = self.whisper_model
             
             print(f"🎙️  [Thread] Transcribing: {episode_info.safe_title}")
-            result = model.transcribe(str(episode_info.audio_path))
-            transcript = result["text"]
-            
-            # Write transcript
-            with open(episode_info.transcript_path, 'w', encoding='utf-8') as f:
-                f.write(f"Title: {episode_info.title}\n")
-                f.write(f"URL: {episode_info.audio_url}\n")
-                f.write(f"Published: {episode_info.published}\n")
-                f.write(f"Episode ID: {episode_info.episode_id}\n")
-                f.write(f"\n--- TRANSCRIPT ---\n\n")
-                f.write(transcript)
+            transcript = transcribe_audio_file(model, episode_info.audio_path)
             
             print(f"✅ [Thread] Transcribed: {episode_info.safe_title}")
-            return episode_info, True
+            return episode_info, transcript
             
         except Exception as e:
             print(f"❌ [Thread] Error transcribing {episode_info.safe_title}: {e}")
-            return episode_info, False
+            return episode_info, None
     
-    def transcribe_episodes(self, episodes: List[EpisodeInfo], mark_processed_callback) -> ProcessingStats:
-        """Transcribe episodes in parallel, return transcription stats"""
-        print(f"\n🎙️  === TRANSCRIPTION PHASE ===")
+    def transcribe_episodes(self, episodes: Iterable[EpisodeInfo], mark_processed_callback) -> ProcessingStats:
+        """Transcribe episodes in parallel, return transcription stats
         
-        # Filter episodes that need transcription
-        episodes_to_transcribe = []
-        already_transcribed = 0
-        
-        for episode in episodes:
-            if episode.transcript_path.exists():
-                print(f"✅ Transcript already exists: {episode.safe_title}")
-                already_transcribed += 1
-            else:
-                episodes_to_transcribe.append(episode)
+        `episodes` may be a generator such as PodcastDownloader.iter_downloaded_episodes,
+        in which case each episode is handed to a worker as soon as it is yielded and
+        transcription overlaps with the remaining downloads.
+        """
+        print(f"\n🎙️  === TRANSCRIPTION PHASE ===")
         
-        if not episodes_to_transcribe:
-            print("🎉 All episodes already transcribed!")
-            return ProcessingStats(
-                total_episodes=len(episodes),
-                already_transcribed=already_transcribed
-            )
+        stats = ProcessingStats()
         
         print(f"🔧 Transcription Configuration:")
-        print(f"   • Episodes to transcribe: {len(episodes_to_transcribe)}")
-        print(f"   • Worker processes/threads: {self.max_workers}")
-        print(f"   • Execution mode: {'Multiprocessing' if self.config.use_multiprocessing else 'Threading'}")
+        if self.batch_size:
+            print(f"   • Execution mode: Batched (batch size {self.batch_size})")
+        else:
+            print(f"   • Worker processes/threads: {self.max_workers}")
+            print(f"   • Execution mode: {'Multiprocessing' if self.config.use_multiprocessing else 'Threading'}")
+        print(f"   • Backend threads per worker: {self.threads_per_worker}")
+        print(f"   • Device: {self.device}")
         print(f"   • CPU cores available: {self.cpu_monitor.cpu_count}")
         
-        # Start CPU monitoring
+        # CPU usage is sampled as each transcription completes
         self.cpu_monitor.start_monitoring()
         
-        successful_transcriptions = 0
+        # Transcripts are written by a single background thread so workers can
+        # move straight on to the next episode; leaving the block waits for all writes
+        write_futures = []
         
-        try:
-            if self.config.use_multiprocessing:
-                successful_transcriptions = self._transcribe_with_processes(
-                    episodes_to_transcribe, mark_processed_callback
-                )
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            def save_transcript(episode_info: EpisodeInfo, transcript: str):
+                write_futures.append(io_pool.submit(
+                    self._save_transcript, episode_info, transcript, mark_processed_callback
+                ))
+            
+            episodes_to_transcribe = self._filter_untranscribed(episodes, stats)
+            if self.batch_size:
+                self._transcribe_batched(episodes_to_transcribe, save_transcript)
+            elif self.config.use_multiprocessing:
+                self._transcribe_with_processes(episodes_to_transcribe, save_transcript)
             else:
-                successful_transcriptions = self._transcribe_with_threads(
-                    episodes_to_transcribe, mark_processed_callback
-                )
+                self._transcribe_with_threads(episodes_to_transcribe, save_transcript)
+        
+        successful_transcriptions = sum(future.result() for future in write_futures)
         
-        finally:
-            # Stop CPU monitoring
-            self.cpu_monitor.stop_monitoring()
+        pending_count = stats.total_episodes - stats.already_transcribed
+        if pending_count == 0:
+            print("🎉 All episodes already transcribed!")
+            return stats
         
-        stats = ProcessingStats(
-            total_episodes=len(episodes),
-            transcribed=successful_transcriptions,
-            already_transcribed=already_transcribed,
-            failed=len(episodes_to_transcribe) - successful_transcriptions
-        )
+        stats.transcribed = successful_transcriptions
+        stats.failed = pending_count - successful_transcriptions
         
         print(f"\n📊 Transcription Summary:")
         print(f"   • Successfully transcribed: {successful_transcriptions} episodes")
-        print(f"   • Already had transcripts: {already_transcribed} episodes")
+        print(f"   • Already had transcripts: {stats.already_transcribed} episodes")
         print(f"   • Failed: {stats.failed} episodes")
+        self.cpu_monitor.print_usage()
         
         return stats
     
-    def _transcribe_with_processes(self, episodes: List[EpisodeInfo], mark_processed_callback) -> int:
+    def _filter_untranscribed(self, episodes: Iterable[EpisodeInfo], stats: ProcessingStats) -> Iterator[EpisodeInfo]:
+        """Yield episodes that still need a transcript, counting the rest in stats"""
+        existing_transcripts = list_dir_names(self.config.transcripts_dir)
+        for episode in episodes:
+            stats.total_episodes += 1
+            if episode.transcript_path.name in existing_transcripts:
+                print(f"✅ Transcript already exists: {episode.safe_title}")
+                stats.already_transcribed += 1
+            else:
+                yield episode
+    
+    def _save_transcript(self, episode_info: EpisodeInfo, transcript: str, mark_processed_callback) -> bool:
+        """Write a finished transcript and mark its episode processed (runs on the I/O thread)"""
+        try:
+            write_transcript(episode_info, transcript)
+        except Exception as e:
+            print(f"❌ Could not write transcript for {episode_info.safe_title}: {e}")
+            return False
+        
+        mark_processed_callback(episode_info.episode_id, processed_episode_data(episode_info))
+        return True
+    
+    def _transcribe_batched(self, episodes: Iterable[EpisodeInfo], save_transcript):
+        """Transcribe episodes one at a time with a single batched pipeline
+        
+        Rather than one model per worker, each episode's voiced chunks are decoded
+        batch_size at a time, which keeps a single model (and GPU) fully busy.
+        """
+        print(f"🚀 Starting batched transcription (batch size {self.batch_size})...")
+        
+        for episode_info in episodes:
+            try:
+                print(f"🎙️  [Batched] Transcribing: {episode_info.safe_title}")
+                transcript = transcribe_audio_file(
+                    self.batched_pipeline, episode_info.audio_path, self.batch_size
+                )
+            except Exception as e:
+                print(f"❌ [Batched] Error transcribing {episode_info.safe_title}: {e}")
+                continue
+            finally:
+                self.cpu_monitor.record_sample()
+            
+            print(f"✅ [Batched] Transcribed: {episode_info.safe_title}")
+            save_transcript(episode_info, transcript)
+    
+    def _transcribe_with_processes(self, episodes: Iterable[EpisodeInfo], save_transcript):
         """Transcribe using ProcessPoolExecutor for maximum CPU utilization"""
         print(f"🚀 Starting {self.max_workers} transcription processes...")
         
-        successful_transcriptions = 0
-        
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Convert EpisodeInfo to dict for multiprocessing
-            episode_dicts = []
+        # Each worker process loads the model once and reuses it for every episode it handles.
+        # Workers are spawned rather than forked: download and writer threads are already
+        # running, and a forked child could inherit a lock one of them holds
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(WHISPER_MODEL_NAME, self.threads_per_worker)
+        ) as executor:
+            # Submit each transcription job as soon as its episode is available; the
+            # dataclass pickles as-is and only the transcript text comes back
+            future_to_episode = {}
             for episode in episodes:
-                episode_dict = {
-                    'title': episode.title,
-                    'audio_url': episode.audio_url,
-                    'published': episode.published,
-                    'episode_id': episode.episode_id,
-                    'audio_path': episode.audio_path,
-                    'transcript_path': episode.transcript_path,
-                    'safe_title': episode.safe_title
-                }
-                episode_dicts.append(episode_dict)
-            
-            # Submit all transcription jobs
-            future_to_episode = {
-                executor.submit(transcribe_audio_worker_func, episode_dict): episode_dict 
-                for episode_dict in episode_dicts
-            }
+                future_to_episode[executor.submit(transcribe_audio_worker_func, episode)] = episode
             
             # Process completed transcriptions
             for future in as_completed(future_to_episode):
-                episode_dict, success = future.result()
+                self.cpu_monitor.record_sample()
+                transcript = future.result()
                 
-                if success:
-                    successful_transcriptions += 1
-                    # Mark episode as processed
-                    episode_data = {
-                        'title': episode_dict['title'],
-                        'published': episode_dict['published'],
-                        'audio_url': episode_dict['audio_url'],
-                        'audio_file': episode_dict['audio_path'].name,
-                        'transcript_file': episode_dict['transcript_path'].name
-                    }
-                    mark_processed_callback(episode_dict['episode_id'], episode_data)
-        
-        return successful_transcriptions
+                if transcript is not None:
+                    save_transcript(future_to_episode[future], transcript)
     
-    def _transcribe_with_threads(self, episodes: List[EpisodeInfo], mark_processed_callback) -> int:
+    def _transcribe_with_threads(self, episodes: Iterable[EpisodeInfo], save_transcript):
         """Transcribe using ThreadPoolExecutor"""
         print(f"🚀 Starting {self.max_workers} transcription threads...")
         
-        successful_transcriptions = 0
-        
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all transcription jobs
-            future_to_episode = {
-                executor.submit(self.transcribe_audio_worker, episode): episode 
-                for episode in episodes
-            }
+            # Submit each transcription job as soon as its episode is available
+            future_to_episode = {}
+            for episode in episodes:
+                future_to_episode[executor.submit(self.transcribe_audio_worker, episode)] = episode
             
             # Process completed transcriptions
             for future in as_completed(future_to_episode):
-                episode_info, success = future.result()
+                self.cpu_monitor.record_sample()
+                episode_info, transcript = future.result()
                 
-                if success:
-                    successful_transcriptions += 1
-                    # Mark episode as processed
-                    episode_data = {
-                        'title': episode_info.title,
-                        'published': episode_info.published,
-                        'audio_url': episode_info.audio_url,
-                        'audio_file': episode_info.audio_path.name,
-                        'transcript_file': episode_info.transcript_path.name
-                    }
-                    mark_processed_callback(episode_info.episode_id, episode_data)
-        
-        return successful_transcriptions 
\ No newline at end of file
+                if transcript is not None:
+                    save_transcript(episode_info, transcript) 
\ No newline at end of file
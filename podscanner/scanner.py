@@ -4,12 +4,13 @@ Main scanner module for detecting and processing podcast sources
 """
 
 import sys
-import subprocess
+import shutil
 from pathlib import Path
 
 from .extractors import extract_apple_podcast_rss, extract_rss_from_website
 from .processors import PodcastDownloader, PodcastTranscriber
-from .models import DownloadConfig
+from .models import DownloadConfig, EpisodeInfo, ProcessingStats
+from .utils import detect_source_type, get_episode_id, load_json_file
 
 class PodScanner:
     """Main scanner class for handling different podcast sources"""
@@ -20,70 +21,103 @@ class PodScanner:
     
     def detect_source_type(self, url: str) -> str:
         """Detect what type of podcast source this is"""
-        url_lower = url.lower()
-        
-        if 'podcasts.apple.com' in url_lower:
-            return 'apple_podcasts'
-        elif 'youtube.com' in url_lower or 'youtu.be' in url_lower:
-            return 'youtube'
-        elif 'spotify.com' in url_lower:
-            return 'spotify'
-        elif url_lower.endswith('.rss') or 'feed' in url_lower or 'rss' in url_lower:
-            return 'rss'
-        else:
-            return 'unknown'
+        return detect_source_type(url)
     
     def download_youtube_podcast(self, url: str, max_episodes: int = None) -> bool:
-        """Download podcast episodes from YouTube using yt-dlp"""
+        """Download podcast episodes from YouTube using yt-dlp
+        
+        yt-dlp runs in-process as a library, so repeated downloads don't pay
+        for a fresh interpreter and extractor imports each time.
+        """
+        try:
+            from yt_dlp import YoutubeDL
+            from yt_dlp.utils import DownloadError
+        except ImportError:
+            print("❌ yt-dlp not found. Please install it:")
+            print("   pip install yt-dlp")
+            return False
+        
         try:
             print(f"📺 Downloading from YouTube: {url}")
             
-            downloads_dir = Path(self.config.download_dir)
+            downloads_dir = Path(self.config.downloads_dir)
             downloads_dir.mkdir(exist_ok=True)
+            # Final audio paths, reported by yt-dlp once each file is post-processed
+            downloaded_paths = []
             
-            # Build yt-dlp command
-            cmd = [
-                'yt-dlp',
-                '--extract-flat', 'false',
-                '--format', 'bestaudio',
-                '--extract-audio',
-                '--audio-format', 'mp3',
-                '--audio-quality', '0',  # Best quality
-                '--output', str(downloads_dir / '%(uploader)s_-_%(title)s.%(ext)s'),
-                '--embed-metadata',
-                '--add-metadata',
-                '--write-info-json',
-            ]
+            # Build yt-dlp options
+            ydl_opts = {
+                'format': 'bestaudio',
+                'outtmpl': str(downloads_dir / '%(uploader)s_-_%(title)s.%(ext)s'),
+                'writeinfojson': True,
+                # CLI defaults that the API doesn't apply: skip unavailable videos
+                # instead of aborting the playlist, and recognise already-converted mp3s
+                'ignoreerrors': 'only_download',
+                'final_ext': 'mp3',
+                # Fetch DASH/HLS fragments in parallel instead of one at a time
+                'concurrent_fragment_downloads': 8,
+                'postprocessors': [
+                    {
+                        'key': 'FFmpegExtractAudio',
+                        'preferredcodec': 'mp3',
+                        'preferredquality': '0',  # Best quality
+                    },
+                    {'key': 'FFmpegMetadata', 'add_metadata': True},
+                ],
+                'post_hooks': [downloaded_paths.append],
+            }
+            
+            # Use aria2c's multi-connection downloads when it is installed
+            if shutil.which('aria2c'):
+                ydl_opts['external_downloader'] = {'default': 'aria2c'}
+                ydl_opts['external_downloader_args'] = {'aria2c': ['-x', '8', '-s', '8']}
             
             # Handle playlist limits
             if max_episodes:
-                cmd.extend(['--playlist-end', str(max_episodes)])
-            
-            cmd.append(url)
+                ydl_opts['playlistend'] = max_episodes
             
-            print(f"🚀 Executing: yt-dlp {url}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            print(f"🚀 Running yt-dlp: {url}")
+            with YoutubeDL(ydl_opts) as ydl:
+                retcode = ydl.download([url])
             
-            print("✅ YouTube download completed!")
+            # With ignoreerrors, failed videos are skipped and only reported through the return code
+            if retcode:
+                print(f"❌ YouTube download failed for some videos (yt-dlp exit code {retcode})")
+            else:
+                print("✅ YouTube download completed!")
             
-            # Optionally trigger transcription
-            if self.config.transcribe_enabled:
+            # Optionally transcribe whatever was downloaded
+            if self.config.transcribe_enabled and downloaded_paths:
                 print("\n🎙️ Starting transcription...")
-                transcriber = PodcastTranscriber(self.config)
-                transcriber.transcribe_all_episodes()
+                episodes = [self._youtube_episode(Path(path)) for path in downloaded_paths]
+                durations = [episode.duration for episode in episodes if episode.duration]
+                mean_duration = sum(durations) / len(durations) if durations else None
+                transcriber = PodcastTranscriber(self.config, mean_duration)
+                transcriber.transcribe_episodes(episodes, PodcastDownloader(self.config).mark_episode_processed)
             
-            return True
+            return retcode == 0
             
-        except subprocess.CalledProcessError as e:
+        except DownloadError as e:
             print(f"❌ YouTube download failed: {e}")
-            if e.stderr:
-                print(f"Error details: {e.stderr}")
-            return False
-        except FileNotFoundError:
-            print("❌ yt-dlp not found. Please install it:")
-            print("   pip install yt-dlp")
             return False
 
+    def _youtube_episode(self, audio_path: Path) -> EpisodeInfo:
+        """Build episode info for a yt-dlp download from its .info.json sidecar"""
+        info = load_json_file(audio_path.with_suffix('.info.json'))
+        title = info.get('title') or audio_path.stem
+        audio_url = info.get('webpage_url', '')
+        published = info.get('upload_date', 'Unknown')
+        return EpisodeInfo(
+            title=title,
+            audio_url=audio_url,
+            published=published,
+            episode_id=get_episode_id({'title': title, 'published': published}, audio_url),
+            audio_path=audio_path,
+            transcript_path=Path(self.config.transcripts_dir) / f"{audio_path.stem}.txt",
+            safe_title=audio_path.stem,
+            duration=info.get('duration')
+        )
+
     def get_spotify_info(self, url: str) -> None:
         """Get information about Spotify podcast (limited support)"""
         print("🎵 Spotify podcast detected...")
@@ -138,19 +172,42 @@ class PodScanner:
         print("\n🎉 Processing complete!")
     
     def _process_rss_feed(self, rss_url: str, max_episodes: int = None) -> None:
-        """Process an RSS feed using the modular components"""
-        # Download episodes
+        """Process an RSS feed using the modular components
+        
+        Downloads run in a thread pool and feed the transcriber as they
+        complete, so network and CPU work overlap instead of running
+        as two separate phases.
+        """
         downloader = PodcastDownloader(self.config)
-        episodes = downloader.parse_episodes_from_feed(rss_url, max_episodes)
+        download_stats = ProcessingStats()
+        episodes = downloader.parse_episodes_from_feed(rss_url, max_episodes, download_stats)
         
         if not episodes:
-            print("❌ No episodes found in the RSS feed")
+            if download_stats.feed_unchanged:
+                return
+            if download_stats.skipped:
+                print("✅ All episodes in the feed were already processed")
+                downloader.save_feed_state(rss_url)
+                downloader.print_download_summary(download_stats)
+            else:
+                print("❌ No episodes found in the RSS feed")
             return
         
-        downloaded_count = downloader.download_episodes(episodes)
+        downloaded = downloader.iter_downloaded_episodes(episodes, download_stats)
+        
+        if self.config.transcribe_enabled:
+            print("\n🎙️ Starting download + transcription pipeline...")
+            # Size the worker pool to the feed's typical episode length
+            durations = [episode.duration for episode in episodes if episode.duration]
+            mean_duration = sum(durations) / len(durations) if durations else None
+            transcriber = PodcastTranscriber(self.config, mean_duration)
+            transcribe_stats = transcriber.transcribe_episodes(downloaded, downloader.mark_episode_processed)
+            
+            # Only skip this feed on unchanged re-scans if nothing needs retrying
+            if download_stats.failed == 0 and transcribe_stats.failed == 0:
+                downloader.save_feed_state(rss_url)
+        else:
+            for _ in downloaded:
+                pass
         
-        # Transcribe if enabled
-        if self.config.transcribe_enabled and downloaded_count > 0:
-            print("\n🎙️ Starting transcription...")
-            transcriber = PodcastTranscriber(self.config)
-            transcriber.transcribe_episodes(episodes)
\ No newline at end of file
+        downloader.print_download_summary(download_stats)
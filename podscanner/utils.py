@@ -7,20 +7,55 @@ Common helper functions and utilities.
 
 import re
 import json
+import functools
 import hashlib
+import logging
+import os
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
 from typing import Dict, Any, Optional
-from urllib.parse import urlparse
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_log = logging.getLogger(__name__)
+
+USER_AGENT = 'podScanner/1.0'
+
+# Files smaller than this aren't worth splitting into parallel range requests
+RANGED_DOWNLOAD_MIN_SIZE = 16 * 1024 * 1024
+
+# Identifies how episode IDs are derived, so stored IDs can be re-keyed when it changes
+EPISODE_ID_SCHEME = ('xxh3_128' if xxhash is not None else 'blake2b_128') + '+canonical_url_v2'
+
+# Query parameters that only track the listener or sign the request, never select the file
+_TRACKING_PARAM_PREFIXES = ('utm_', 'aw_', 'fbclid', 'gclid', 'mc_', 'x-amz-')
+_SIGNING_PARAMS = frozenset({'token', 'expires', 'signature', 'key-pair-id', 'policy'})
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_INVALID_CHARS_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(filename: str) -> str:
     """Remove or replace characters that aren't valid in filenames"""
     # Remove HTML tags
-    filename = re.sub(r'<[^>]+>', '', filename)
+    filename = _HTML_TAG_RE.sub('', filename)
     # Replace invalid characters with underscores
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = filename.translate(_INVALID_CHARS_TABLE)
     # Remove multiple spaces and replace with single underscore
-    filename = re.sub(r'\s+', '_', filename)
+    filename = _WHITESPACE_RE.sub('_', filename)
     # Limit length
     if len(filename) > 200:
         filename = filename[:200]
@@ -30,17 +65,72 @@ def get_episode_id(episode: Dict[str, Any], audio_url: str) -> str:
     """Generate a unique ID for an episode based on URL and title"""
     # Use URL as primary identifier, fallback to title hash
     if audio_url:
-        return hashlib.md5(audio_url.encode()).hexdigest()
+        return _hash_key(_canonical_audio_url(audio_url))
     else:
         title = episode.get('title', '')
         published = episode.get('published', '')
-        return hashlib.md5(f"{title}{published}".encode()).hexdigest()
+        return _hash_key(f"{title}{published}")
+
+def _canonical_audio_url(url: str) -> str:
+    """Normalize an enclosure URL so tracker variants of the same file share an ID
+    
+    The scheme and host are lowercased, the fragment is dropped and tracking or
+    signing parameters are removed. Other parameters are kept, since hosts such
+    as `download.mp3?episode=123` select the episode through the query.
+    """
+    parts = urlsplit(url)
+    query = '&'.join(
+        param for param in parts.query.split('&')
+        if param and not _is_tracking_param(param.split('=', 1)[0].lower())
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
+def _is_tracking_param(key: str) -> bool:
+    """Whether a lowercased query parameter name only tracks or signs the request"""
+    return key.startswith(_TRACKING_PARAM_PREFIXES) or key in _SIGNING_PARAMS
+
+@functools.lru_cache(maxsize=4096)
+def _hash_key(key: str) -> str:
+    """Hash a dedup key with xxh3 when available, 128-bit BLAKE2b otherwise
+    
+    BLAKE2b is used rather than MD5 because FIPS-restricted builds refuse MD5.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(key.encode())
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+def parse_duration(value) -> Optional[float]:
+    """Parse an itunes:duration value ("3600", "59:30" or "1:02:03") into seconds"""
+    if not value:
+        return None
+    seconds = 0.0
+    try:
+        for part in str(value).strip().split(':'):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return None
+    return seconds
 
 def get_file_extension_from_url(url: str) -> str:
     """Extract file extension from URL, default to .mp3"""
-    parsed_url = urlparse(url)
-    ext = Path(parsed_url.path).suffix
-    return ext if ext else '.mp3'
+    # Scanned by hand rather than via urlparse + Path since it runs for every feed entry
+    path = url.split('#', 1)[0].split('?', 1)[0]
+    scheme_end = path.find('://')
+    if scheme_end != -1 or path.startswith('//'):
+        # Drop the scheme and host
+        path_start = path.find('/', scheme_end + 3 if scheme_end != -1 else 2)
+        path = path[path_start:] if path_start != -1 else ''
+    # Parameters after ';' only apply to the last segment
+    params_start = path.find(';', path.rfind('/'))
+    if params_start != -1:
+        path = path[:params_start]
+    # Last real segment, ignoring trailing slashes and '.' like Path does
+    name = next((segment for segment in reversed(path.split('/')) if segment not in ('', '.')), '')
+    dot = name.rfind('.')
+    # Like Path.suffix: dotfiles and names ending in a dot have no extension
+    if dot <= 0 or dot == len(name) - 1:
+        return '.mp3'
+    return name[dot:]
 
 def load_json_file(filepath: Path) -> Dict[str, Any]:
     """Load JSON file with error handling"""
@@ -48,47 +138,103 @@ def load_json_file(filepath: Path) -> Dict[str, Any]:
         return {}
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # Read the raw bytes in one sized call; both parsers accept bytes
+        with open(filepath, 'rb') as f:
+            data = f.read(os.fstat(f.fileno()).st_size)
+        if not data:
+            return {}
+        return orjson.loads(data) if orjson is not None else json.loads(data)
     except Exception as e:
-        print(f"Warning: Could not load {filepath}: {e}")
+        _log.warning("Could not load %s: %s", filepath, e)
         return {}
 
-def save_json_file(filepath: Path, data: Dict[str, Any]) -> bool:
-    """Save data to JSON file with error handling"""
+# Digest of the payload last written to each path by save_json_file
+_LAST_WRITTEN: Dict[Path, bytes] = {}
+
+def save_json_file(filepath: Path, data: Dict[str, Any], indent: Optional[int] = 2) -> bool:
+    """Save data to JSON file with error handling
+    
+    The data is written to a temporary file that then replaces the target,
+    so a crash mid-write never leaves a truncated file behind.
+    """
+    tmp_path = filepath.with_name(filepath.name + '.tmp')
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # orjson only knows 2-space indentation; other widths go through the stdlib
+        if orjson is not None and indent in (None, 2):
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        else:
+            payload = json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+        
+        # Nothing to do if this exact payload is what we last wrote there
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if _LAST_WRITTEN.get(filepath) == digest and filepath.exists():
+            return True
+        
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+        _LAST_WRITTEN[filepath] = digest
         return True
     except Exception as e:
-        print(f"Warning: Could not save {filepath}: {e}")
+        _log.warning("Could not save %s: %s", filepath, e)
+        tmp_path.unlink(missing_ok=True)
         return False
 
-def create_episode_metadata(episode_info, episode_id: str) -> Dict[str, Any]:
-    """Create metadata dict for processed episode"""
+def list_dir_names(directory: Path) -> set:
+    """Return the names of all entries in a directory (empty if it doesn't exist)
+    
+    One readdir replaces a stat() per file when checking many paths for existence.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+# (epoch second, formatted timestamp) most recently produced by _current_timestamp
+_timestamp_cache = (0, '')
+
+def _current_timestamp() -> str:
+    """Local time as 'YYYY-MM-DD HH:MM:SS', formatted at most once per second"""
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, formatted = _timestamp_cache
+    if now != cached_second:
+        formatted = datetime.fromtimestamp(now).isoformat(sep=' ')
+        _timestamp_cache = (now, formatted)
+    return formatted
+
+def create_episode_metadata(episode_info, episode_id: str, processed_date: Optional[str] = None) -> Dict[str, Any]:
+    """Create metadata dict for processed episode
+    
+    Callers recording many episodes at once can pass a shared `processed_date`.
+    """
+    if processed_date is None:
+        processed_date = _current_timestamp()
     return {
         'title': episode_info.get('title', 'Unknown'),
         'published': episode_info.get('published', 'Unknown'), 
         'audio_url': episode_info.get('audio_url', ''),
-        'processed_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'processed_date': processed_date,
         'audio_file': episode_info.get('audio_file', ''),
         'transcript_file': episode_info.get('transcript_file', '')
     }
 
+# Source markers; when several match, the earlier entry in _SOURCE_PRIORITY wins
+_SOURCE_RE = re.compile(
+    r'(?P<apple_podcasts>podcasts\.apple\.com)'
+    r'|(?P<youtube>youtube\.com|youtu\.be)'
+    r'|(?P<spotify>spotify\.com)'
+    r'|(?P<rss>feed|rss)',
+    re.IGNORECASE
+)
+_SOURCE_PRIORITY = ('apple_podcasts', 'youtube', 'spotify', 'rss')
+
 def detect_source_type(url: str) -> str:
     """Detect what type of podcast source this is"""
-    url_lower = url.lower()
-    
-    if 'podcasts.apple.com' in url_lower:
-        return 'apple_podcasts'
-    elif 'youtube.com' in url_lower or 'youtu.be' in url_lower:
-        return 'youtube'
-    elif 'spotify.com' in url_lower:
-        return 'spotify'
-    elif url_lower.endswith('.rss') or 'feed' in url_lower or 'rss' in url_lower:
-        return 'rss'
-    else:
-        return 'unknown'
+    # One case-insensitive scan collects every marker present in the URL
+    found = {match.lastgroup for match in _SOURCE_RE.finditer(url)}
+    return next((source for source in _SOURCE_PRIORITY if source in found), 'unknown')
 
 def format_time_duration(seconds: float) -> str:
     """Format duration in seconds to human readable format"""
@@ -117,24 +263,123 @@ def print_stats_summary(stats, title: str = "Processing Summary"):
     if hasattr(stats, 'already_transcribed'):
         print(f"   • Already transcribed: {stats.already_transcribed}")
 
-def download_file(url: str, filepath: Path, chunk_size: int = 8192) -> bool:
+def create_http_session(pool_connections: int = 4, pool_maxsize: int = 16, retries: int = 3):
+    """Create a requests Session with connection pooling and retries
+    
+    Reusing one session keeps connections alive between requests to the
+    same host, so repeated downloads skip the TCP/TLS handshake.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def download_file(url: str, filepath: Path, chunk_size: int = 1024 * 1024, session=None) -> bool:
     """Download a file from URL to filepath with progress indicator"""
     import requests
     from tqdm import tqdm
     
+    http = session or requests
+    
     try:
         print(f"📥 Downloading: {filepath.name}")
-        response = requests.get(url, stream=True, timeout=30)
-        response.raise_for_status()
+        # Closing the response returns its connection to the session's pool
+        with http.get(url, stream=True, timeout=(5, 30)) as response:
+            response.raise_for_status()
+            
+            total_size = int(response.headers.get('content-length', 0))
+            
+            # Let urllib3 undo any transfer encoding so raw reads yield file bytes
+            response.raw.decode_content = True
+            
+            with open(filepath, 'wb', buffering=chunk_size) as f:
+                # tqdm counts bytes as they are written and redraws at most once a second,
+                # so concurrent downloads don't contend for stdout on every chunk
+                with tqdm.wrapattr(f, 'write', total=total_size, desc=filepath.name, mininterval=1.0) as out:
+                    shutil.copyfileobj(response.raw, out, length=chunk_size)
         
-        total_size = int(response.headers.get('content-length', 0))
+        print(f"✅ Downloaded: {filepath.name}")
+        return True
         
+    except Exception as e:
+        print(f"❌ Download failed for {filepath.name}: {str(e)}")
+        if filepath.exists():
+            filepath.unlink()  # Remove partial download
+        return False 
+
+def download_file_ranged(url: str, filepath: Path, parts: int = 4, chunk_size: int = 1024 * 1024,
+                         session=None, claim_parts=None) -> bool:
+    """Download a file as parallel byte ranges when the server supports them
+    
+    Several TCP streams fill fast, long-haul links that a single stream can't.
+    Falls back to download_file for small files and servers without range support.
+    `claim_parts`, if given, is called with `parts` once a ranged download has been
+    chosen and returns how many parts may actually be used.
+    """
+    import requests
+    from tqdm import tqdm
+    
+    http = session or requests
+    
+    try:
+        head = http.head(url, allow_redirects=True, timeout=(5, 30))
+        head.raise_for_status()
+        total_size = int(head.headers.get('content-length', 0))
+        ranged = (
+            parts > 1
+            and head.headers.get('accept-ranges', '').lower() == 'bytes'
+            and 'content-encoding' not in head.headers
+            and total_size >= RANGED_DOWNLOAD_MIN_SIZE
+        )
+    except (requests.RequestException, ValueError):
+        ranged = False
+    
+    if ranged and claim_parts is not None:
+        parts = claim_parts(parts)
+        ranged = parts > 1
+    
+    if not ranged:
+        return download_file(url, filepath, chunk_size, session)
+    
+    # Request the ranges from the final location so each part skips the redirects
+    url = head.url
+    part_size = -(-total_size // parts)
+    ranges = [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+    
+    try:
+        print(f"📥 Downloading: {filepath.name} ({len(ranges)} parts)")
+        # Preallocate so every part can write at its own offset
         with open(filepath, 'wb') as f:
-            with tqdm(total=total_size, unit='B', unit_scale=True, desc=filepath.name) as pbar:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        pbar.update(len(chunk))
+            f.truncate(total_size)
+        
+        with tqdm(total=total_size, unit='B', unit_scale=True, desc=filepath.name, mininterval=1.0) as progress:
+            def fetch_range(byte_range):
+                start, end = byte_range
+                written = 0
+                headers = {'Range': f'bytes={start}-{end}'}
+                with http.get(url, headers=headers, stream=True, timeout=(5, 30)) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise IOError(f"server ignored range request (HTTP {response.status_code})")
+                    with open(filepath, 'r+b', buffering=chunk_size) as f:
+                        f.seek(start)
+                        for data in response.iter_content(chunk_size):
+                            f.write(data)
+                            written += len(data)
+                            progress.update(len(data))
+                if written != end - start + 1:
+                    raise IOError(f"incomplete range {start}-{end}: got {written} bytes")
+            
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                list(executor.map(fetch_range, ranges))
         
         print(f"✅ Downloaded: {filepath.name}")
         return True
@@ -143,4 +388,4 @@ def download_file(url: str, filepath: Path, chunk_size: int = 8192) -> bool:
         print(f"❌ Download failed for {filepath.name}: {str(e)}")
         if filepath.exists():
             filepath.unlink()  # Remove partial download
-        return False 
\ No newline at end of file
+        return False